@@ -2,9 +2,11 @@ package main
 
 import (
 	"fmt"
+	"io"
 	"os"
 	"path/filepath"
 	"strings"
+	"sync"
 
 	"github.com/reecepbcups/docci/executor"
 	"github.com/reecepbcups/docci/logger"
@@ -19,6 +21,11 @@ type DocciResult struct {
 	Stdout           string
 	Stderr           string
 	ValidationErrors []error
+
+	// Number of blocks whose expectations were checked, so callers can report
+	// on validations without parsing the markdown again
+	OutputContainsBlocks int // blocks with docci-output-contains
+	AssertFailureBlocks  int // blocks with docci-assert-failure
 }
 
 // RunDocciFile executes all the logic for processing a docci markdown file
@@ -36,7 +43,7 @@ func RunDocciFileWithOptions(filePath string, opts types.DocciOpts) DocciResult
 
 	// Read the file into a string
 	log.Debug("Reading file", "path", filePath)
-	markdown, err := os.ReadFile(filePath)
+	markdown, err := readMarkdown(filePath)
 	if err != nil {
 		log.Error("Failed to read file", "error", err.Error())
 		return DocciResult{
@@ -48,7 +55,7 @@ func RunDocciFileWithOptions(filePath string, opts types.DocciOpts) DocciResult
 
 	// Parse code blocks with metadata
 	log.Debug("Parsing code blocks from markdown")
-	blocks, err := parser.ParseCodeBlocks(string(markdown))
+	blocks, err := parser.ParseCodeBlocks(markdown)
 	if err != nil {
 		log.Error("Failed to parse code blocks", "error", err.Error())
 		return DocciResult{
@@ -111,13 +118,13 @@ func RunDocciFileWithOptions(filePath string, opts types.DocciOpts) DocciResult
 		}
 	}
 
-	// Parse block outputs from the stdout
-	log.Debug("Parsing block outputs")
-	blockOutputs := executor.ParseBlockOutputs(resp.Stdout)
-
-	// Validate outputs if there are any validation requirements
+	// Validate outputs if there are any validation requirements. Block outputs
+	// are only split out of stdout when something is going to check them.
 	var validationErrors []error
 	if len(validationMap) > 0 {
+		log.Debug("Parsing block outputs")
+		blockOutputs := executor.ParseBlockOutputs(resp.Stdout)
+
 		log.Debug("Validating output expectations", "count", len(validationMap))
 		validationErrors = executor.ValidateOutputs(blockOutputs, validationMap)
 		if len(validationErrors) > 0 {
@@ -139,12 +146,34 @@ func RunDocciFileWithOptions(filePath string, opts types.DocciOpts) DocciResult
 
 	log.Debug("Script execution completed successfully")
 	return DocciResult{
-		Success:          true,
-		ExitCode:         0,
-		Stdout:           resp.Stdout,
-		Stderr:           resp.Stderr,
-		ValidationErrors: nil,
+		Success:              true,
+		ExitCode:             0,
+		Stdout:               resp.Stdout,
+		Stderr:               resp.Stderr,
+		ValidationErrors:     nil,
+		OutputContainsBlocks: len(validationMap),
+		AssertFailureBlocks:  len(assertFailureMap),
+	}
+}
+
+// readMarkdown reads a markdown file straight into a string. Copying into a
+// builder sized from the file avoids holding both the []byte from os.ReadFile
+// and the string converted from it.
+func readMarkdown(filePath string) (string, error) {
+	f, err := os.Open(filePath)
+	if err != nil {
+		return "", err
+	}
+	defer f.Close()
+
+	var markdown strings.Builder
+	if info, err := f.Stat(); err == nil {
+		markdown.Grow(int(info.Size()))
+	}
+	if _, err := io.Copy(&markdown, f); err != nil {
+		return "", err
 	}
+	return markdown.String(), nil
 }
 
 // RunDocciCommand runs a docci file and handles output/exit like the main function
@@ -159,16 +188,7 @@ func RunDocciCommand(filePath string) {
 	// Print success message for validations if applicable
 	if result.Success && len(result.ValidationErrors) == 0 {
 		// Check if there were any validations that passed
-		markdown, _ := os.ReadFile(filePath)
-		blocks, _ := parser.ParseCodeBlocks(string(markdown))
-		hasValidations := false
-		for _, block := range blocks {
-			if block.OutputContains != "" || block.AssertFailure {
-				hasValidations = true
-				break
-			}
-		}
-		if hasValidations {
+		if result.OutputContainsBlocks > 0 || result.AssertFailureBlocks > 0 {
 			log.Info("\n=== All validations passed ✓ ===")
 		}
 	}
@@ -196,11 +216,38 @@ func RunDocciFilesWithOptions(filePaths []string, opts types.DocciOpts) DocciRes
 	var allBlocks []parser.CodeBlock
 	globalIndex := 1
 
-	// Parse all files and collect blocks with filename metadata
-	for _, filePath := range filePaths {
-		log.Debug("Reading file", "path", filePath)
-		markdown, err := os.ReadFile(filePath)
-		if err != nil {
+	// Read and parse every file concurrently. Files are independent, so only
+	// the merge below has to run in order to keep block indexes stable.
+	type parsedFile struct {
+		blocks   []parser.CodeBlock
+		readErr  error
+		parseErr error
+	}
+	parsed := make([]parsedFile, len(filePaths))
+
+	var wg sync.WaitGroup
+	for i, filePath := range filePaths {
+		wg.Add(1)
+		go func(i int, filePath string) {
+			defer wg.Done()
+			log.Debug("Reading file", "path", filePath)
+			markdown, err := readMarkdown(filePath)
+			if err != nil {
+				parsed[i].readErr = err
+				return
+			}
+
+			// Parse code blocks with filename metadata
+			log.Debug("Parsing code blocks", "path", filePath)
+			fileName := filepath.Base(filePath)
+			parsed[i].blocks, parsed[i].parseErr = parser.ParseCodeBlocksWithFileName(markdown, fileName)
+		}(i, filePath)
+	}
+	wg.Wait()
+
+	// Collect blocks in file order, reporting the first failing file
+	for i, filePath := range filePaths {
+		if err := parsed[i].readErr; err != nil {
 			log.Error("Failed to read file", "path", filePath, "error", err.Error())
 			return DocciResult{
 				Success:  false,
@@ -208,12 +255,7 @@ func RunDocciFilesWithOptions(filePaths []string, opts types.DocciOpts) DocciRes
 				Stderr:   fmt.Sprintf("Error reading file %s: %s", filePath, err.Error()),
 			}
 		}
-
-		// Parse code blocks with filename metadata
-		log.Debug("Parsing code blocks", "path", filePath)
-		fileName := filepath.Base(filePath)
-		blocks, err := parser.ParseCodeBlocksWithFileName(string(markdown), fileName)
-		if err != nil {
+		if err := parsed[i].parseErr; err != nil {
 			log.Error("Failed to parse code blocks", "path", filePath, "error", err.Error())
 			return DocciResult{
 				Success:  false,
@@ -223,8 +265,9 @@ func RunDocciFilesWithOptions(filePaths []string, opts types.DocciOpts) DocciRes
 		}
 
 		// Reindex blocks to ensure global uniqueness
-		for i := range blocks {
-			blocks[i].Index = globalIndex
+		blocks := parsed[i].blocks
+		for j := range blocks {
+			blocks[j].Index = globalIndex
 			globalIndex++
 		}
 
@@ -285,13 +328,13 @@ func RunDocciFilesWithOptions(filePaths []string, opts types.DocciOpts) DocciRes
 		}
 	}
 
-	// Parse block outputs from the stdout
-	log.Debug("Parsing block outputs")
-	blockOutputs := executor.ParseBlockOutputs(resp.Stdout)
-
-	// Validate outputs if there are any validation requirements
+	// Validate outputs if there are any validation requirements. Block outputs
+	// are only split out of stdout when something is going to check them.
 	var validationErrors []error
 	if len(validationMap) > 0 {
+		log.Debug("Parsing block outputs")
+		blockOutputs := executor.ParseBlockOutputs(resp.Stdout)
+
 		log.Debug("Validating output expectations", "count", len(validationMap))
 		validationErrors = executor.ValidateOutputs(blockOutputs, validationMap)
 		if len(validationErrors) > 0 {
@@ -316,10 +359,12 @@ func RunDocciFilesWithOptions(filePaths []string, opts types.DocciOpts) DocciRes
 	log.Info("Successfully executed merged files", "files", fileList)
 
 	return DocciResult{
-		Success:          true,
-		ExitCode:         0,
-		Stdout:           resp.Stdout,
-		Stderr:           resp.Stderr,
-		ValidationErrors: nil,
+		Success:              true,
+		ExitCode:             0,
+		Stdout:               resp.Stdout,
+		Stderr:               resp.Stderr,
+		ValidationErrors:     nil,
+		OutputContainsBlocks: len(validationMap),
+		AssertFailureBlocks:  len(assertFailureMap),
 	}
 }
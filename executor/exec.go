@@ -2,16 +2,32 @@ package executor
 
 import (
 	"bufio"
+	"bytes"
 	"fmt"
 	"io"
+	"math"
 	"os"
 	"os/exec"
+	"strconv"
 	"strings"
 	"sync"
 
 	"github.com/reecepbcups/docci/logger"
 )
 
+// readBufferSize is the initial line buffer for each output reader, matching a
+// typical pipe buffer so most reads fill it in one go
+const readBufferSize = 64 * 1024
+
+// Lines on stdout that are captured for validation but never shown to the user
+var (
+	blockMarkerPrefix = []byte("DOCCI_BLOCK_") // shared by the start and end markers
+	blockStartMarker  = []byte("DOCCI_BLOCK_START_")
+	blockEndMarker    = []byte("DOCCI_BLOCK_END_")
+	cleanupMessage    = []byte("Cleaning up background processes")
+	codeBlockHeader   = []byte("=== Code Block")
+)
+
 type ExecResponse struct {
 	ExitCode uint
 	Error    error // only if ExitCode != 0
@@ -52,68 +68,60 @@ func Exec(commands string) (ExecResponse, error) {
 		return ExecResponse{}, fmt.Errorf("start command: %w", err)
 	}
 
-	var stdoutBuf, stderrBuf strings.Builder // captures output for further validation
-	var mu sync.Mutex // For thread-safe string builder access
-
-	// Create goroutines to read both stdout and stderr concurrently
-	done := make(chan bool, 2)
+	// Captures output for further validation. Each builder is only written by
+	// its own reader and read after wg.Wait, so no lock is needed.
+	var stdoutBuf, stderrBuf strings.Builder
 
-	// Handle stdout
-	go func() {
-		scanner := bufio.NewScanner(stdout)
-		for scanner.Scan() {
-			line := scanner.Text()
-			if line != "" {
-				// Don't print DOCCI markers and cleanup messages to stdout
-				shouldPrint := true
-
-				if strings.Contains(line, "DOCCI_BLOCK_START_") || strings.Contains(line, "DOCCI_BLOCK_END_") {
-					shouldPrint = false
-				}
-				if strings.Contains(line, "Cleaning up background processes") {
-					shouldPrint = false
-				}
-				// Don't show "=== Code Block" headers
-				if strings.Contains(line, "=== Code Block") {
-					shouldPrint = false
-				}
-
-				if shouldPrint {
-					io.WriteString(os.Stdout, line+"\n")
-				}
-				// Always capture in buffer for validation
-				mu.Lock()
-				stdoutBuf.WriteString(line + "\n")
-				mu.Unlock()
-			}
-		}
-		done <- true
-	}()
+	// Read stderr on its own goroutine while this one reads stdout, so
+	// neither pipe can fill up and block the command
+	var wg sync.WaitGroup
+	wg.Add(1)
 
 	// Handle stderr
 	go func() {
-		scanner := bufio.NewScanner(stderr)
+		defer wg.Done()
+		w := bufio.NewWriterSize(os.Stderr, readBufferSize)
+		defer w.Flush()
+		scanner := newLineScanner(flushingReader{stderr, w})
+		var out []byte // reused line buffer, avoids a string allocation per line
 		for scanner.Scan() {
-			line := scanner.Text()
-			if line != "" {
+			line := scanner.Bytes()
+			if len(line) > 0 {
+				out = append(append(out[:0], line...), '\n')
 
 				// TODO: DevEx:
 				// if error like `bash: -c: line 3: unexpected EOF while looking for matching `"'`
 				// show the actual line number in the file / code block section to help debug.
 				// This case above is when you forget to add a closing quote to an echo line.
 
-				io.WriteString(os.Stderr, line+"\n")
-				mu.Lock()
-				stderrBuf.WriteString(line + "\n")
-				mu.Unlock()
+				w.Write(out)
+				stderrBuf.Write(out)
 			}
 		}
-		done <- true
 	}()
 
-	// Wait for both goroutines to finish
-	<-done
-	<-done
+	// Handle stdout
+	w := bufio.NewWriterSize(os.Stdout, readBufferSize)
+	scanner := newLineScanner(flushingReader{stdout, w})
+	var out []byte // reused line buffer, avoids a string allocation per line
+	for scanner.Scan() {
+		line := scanner.Bytes()
+		if len(line) > 0 {
+			out = append(append(out[:0], line...), '\n')
+
+			// Don't print DOCCI markers, cleanup messages and "=== Code Block"
+			// headers to stdout
+			if !isHiddenLine(line) {
+				w.Write(out)
+			}
+			// Always capture in buffer for validation
+			stdoutBuf.Write(out)
+		}
+	}
+	w.Flush()
+
+	// Wait for the stderr reader to drain its pipe
+	wg.Wait()
 
 	if err := cmd.Wait(); err != nil {
 		if exitError, ok := err.(*exec.ExitError); ok {
@@ -130,24 +138,61 @@ func Exec(commands string) (ExecResponse, error) {
 	return NewExecResponse(0, stdoutBuf.String(), stderrBuf.String(), nil), nil
 }
 
+// newLineScanner returns a line scanner for a command's output. The line length
+// is not capped: bufio's default 64KB limit would stop the scanner on a long
+// line and leave the pipe undrained, blocking the command.
+func newLineScanner(r io.Reader) *bufio.Scanner {
+	scanner := bufio.NewScanner(r)
+	scanner.Buffer(make([]byte, readBufferSize), math.MaxInt)
+	return scanner
+}
+
+// isHiddenLine reports whether a stdout line is internal to docci. The checks
+// stop at the first match, and the start and end markers are only looked for
+// in lines that contain their shared prefix.
+func isHiddenLine(line []byte) bool {
+	return bytes.Contains(line, blockMarkerPrefix) && (bytes.Contains(line, blockStartMarker) || bytes.Contains(line, blockEndMarker)) ||
+		bytes.Contains(line, cleanupMessage) ||
+		bytes.Contains(line, codeBlockHeader)
+}
+
+// flushingReader flushes w before every read from the command's pipe. The
+// scanner only reads once it has handled every buffered line, so output is
+// echoed in one write per chunk while still showing up before docci waits on
+// the command for more.
+type flushingReader struct {
+	r io.Reader
+	w *bufio.Writer
+}
+
+func (f flushingReader) Read(p []byte) (int, error) {
+	f.w.Flush()
+	return f.r.Read(p)
+}
+
 // ParseBlockOutputs extracts output for each code block based on markers
 func ParseBlockOutputs(output string) map[int]string {
 	log := logger.GetLogger()
 	log.Debug("Parsing block outputs from execution result")
 	blockOutputs := make(map[int]string)
-	lines := strings.Split(output, "\n")
 
 	var currentBlock int
 	var currentOutput strings.Builder
 	inBlock := false
 
-	for _, line := range lines {
+	// Walk the output line by line without splitting it into a slice first
+	for rest := output; rest != ""; {
+		var line string
+		line, rest, _ = strings.Cut(rest, "\n")
+
 		// Check for start marker
 		if strings.HasPrefix(line, "### DOCCI_BLOCK_START_") && strings.HasSuffix(line, " ###") {
 			// Extract block number
 			marker := strings.TrimPrefix(line, "### DOCCI_BLOCK_START_")
 			marker = strings.TrimSuffix(marker, " ###")
-			fmt.Sscanf(marker, "%d", &currentBlock)
+			if n, err := strconv.Atoi(marker); err == nil {
+				currentBlock = n
+			}
 			log.Debug("Found start marker for block", "block", currentBlock)
 			inBlock = true
 			currentOutput.Reset()
@@ -157,8 +202,9 @@ func ParseBlockOutputs(output string) map[int]string {
 		// Check for end marker
 		if strings.HasPrefix(line, "### DOCCI_BLOCK_END_") && strings.HasSuffix(line, " ###") {
 			if inBlock {
-				blockOutputs[currentBlock] = strings.TrimSpace(currentOutput.String())
-				log.Debug("Found end marker for block", "block", currentBlock, "capturedOutputLength", len(blockOutputs[currentBlock]))
+				captured := strings.TrimSpace(currentOutput.String())
+				blockOutputs[currentBlock] = captured
+				log.Debug("Found end marker for block", "block", currentBlock, "capturedOutputLength", len(captured))
 			}
 			inBlock = false
 			continue
@@ -2,7 +2,6 @@ package main
 
 import (
 	"encoding/json"
-	"io"
 	"net/http"
 	"strings"
 	"time"
@@ -79,14 +78,9 @@ func GetLatestGithubReleases(apiRepoURL string) ([]Release, error) {
 	}
 	defer res.Body.Close()
 
-	body, err := io.ReadAll(res.Body)
-	if err != nil {
-		return nil, err
-	}
-
-	// parse response
+	// parse response, decoding directly from the body stream
 	var releases []Release
-	if err := json.Unmarshal(body, &releases); err != nil {
+	if err := json.NewDecoder(res.Body).Decode(&releases); err != nil {
 		return nil, err
 	}
 
@@ -29,8 +29,6 @@ func (h *ColorHandler) Enabled(_ context.Context, level slog.Level) bool {
 }
 
 func (h *ColorHandler) Handle(_ context.Context, r slog.Record) error {
-	timeStr := r.Time.Format("15:04:05")
-
 	var levelColor, levelStr string
 	switch r.Level {
 	case slog.LevelDebug:
@@ -50,16 +48,23 @@ func (h *ColorHandler) Handle(_ context.Context, r slog.Record) error {
 		levelStr = r.Level.String()
 	}
 
-	// Build attrs string
-	var attrs string
+	// Build the whole line, attrs included, in one buffer and write it once
+	buf := make([]byte, 0, 128)
+	buf = append(buf, levelColor...)
+	buf = append(buf, levelStr...)
+	buf = append(buf, colorReset...)
+	buf = append(buf, '(')
+	buf = r.Time.AppendFormat(buf, "15:04:05")
+	buf = append(buf, ") "...)
+	buf = append(buf, r.Message...)
 	r.Attrs(func(a slog.Attr) bool {
-		attrs += fmt.Sprintf(" %s=%v", a.Key, a.Value)
+		buf = fmt.Appendf(buf, " %s=%v", a.Key, a.Value)
 		return true
 	})
+	buf = append(buf, '\n')
 
-	fmt.Fprintf(h.out, "%s%s%s(%s) %s%s\n",
-		levelColor, levelStr, colorReset, timeStr, r.Message, attrs)
-	return nil
+	_, err := h.out.Write(buf)
+	return err
 }
 
 func (h *ColorHandler) WithAttrs(attrs []slog.Attr) slog.Handler {
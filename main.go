@@ -73,28 +73,28 @@ File paths in the JSON config are resolved relative to the config file's locatio
 		// Parse multiple files if provided
 		filePaths := parseFileList(input)
 
-		// Convert relative paths to absolute paths
+		// Convert relative paths to absolute paths and check that each one exists,
+		// using a single stat per file
 		for i, filePath := range filePaths {
 			absPath, err := filepath.Abs(filePath)
 			if err != nil {
 				return fmt.Errorf("failed to resolve absolute path for %s: %w", filePath, err)
 			}
-			filePaths[i] = absPath
-		}
-
-		// Check if all files exist
-		for _, filePath := range filePaths {
-			if _, err := os.Stat(filePath); os.IsNotExist(err) {
-				return fmt.Errorf("file not found: %s", filePath)
+			info, err := os.Stat(absPath)
+			if os.IsNotExist(err) {
+				return fmt.Errorf("file not found: %s", absPath)
 			}
+			if err == nil && info.IsDir() {
+				return fmt.Errorf("expected a file but found a directory: %s", absPath)
+			}
+			filePaths[i] = absPath
 		}
 
 		// Validate and change working directory if workingDir is specified
 		if workingDir != "" {
-			if _, err := os.Stat(workingDir); os.IsNotExist(err) {
+			if err := os.Chdir(workingDir); os.IsNotExist(err) {
 				return fmt.Errorf("run directory not found: %s", workingDir)
-			}
-			if err := os.Chdir(workingDir); err != nil {
+			} else if err != nil {
 				return fmt.Errorf("failed to change to run directory %s: %w", workingDir, err)
 			}
 			log.Info("changed working directory", "dir", workingDir)
@@ -135,32 +135,7 @@ File paths in the JSON config are resolved relative to the config file's locatio
 		// Print success message for validations if applicable
 		if result.Success && len(result.ValidationErrors) == 0 {
 			// Check if there were any validations that passed
-			hasValidations := false
-			if len(filePaths) == 1 {
-				markdown, _ := os.ReadFile(filePaths[0])
-				blocks, _ := parser.ParseCodeBlocks(string(markdown))
-				for _, block := range blocks {
-					if block.OutputContains != "" {
-						hasValidations = true
-						break
-					}
-				}
-			} else {
-				// For multiple files, check if any had validations
-				for _, filePath := range filePaths {
-					markdown, _ := os.ReadFile(filePath)
-					blocks, _ := parser.ParseCodeBlocks(string(markdown))
-					for _, block := range blocks {
-						if block.OutputContains != "" {
-							hasValidations = true
-							break
-						}
-					}
-					if hasValidations {
-						break
-					}
-				}
-			}
+			hasValidations := result.OutputContainsBlocks > 0
 			if hasValidations {
 				log.Info("All validations passed")
 			}
@@ -247,13 +222,13 @@ var validateCmd = &cobra.Command{
 		log.Info("Validating file", "file", filePath)
 
 		// Read the file
-		markdown, err := os.ReadFile(filePath)
+		markdown, err := readMarkdown(filePath)
 		if err != nil {
 			return fmt.Errorf("error reading file: %w", err)
 		}
 
 		// Parse code blocks
-		blocks, err := parser.ParseCodeBlocks(string(markdown))
+		blocks, err := parser.ParseCodeBlocks(markdown)
 		if err != nil {
 			return fmt.Errorf("error parsing code blocks: %w", err)
 		}
@@ -328,13 +303,7 @@ func runPreCommands(commands []string) error {
 	for _, command := range commands {
 		log.Info("Running", "command", command)
 
-		// Create command
-		cmd := exec.Command("bash", "-c", command)
-		cmd.Stdout = os.Stdout
-		cmd.Stderr = os.Stderr
-
-		// Run the command
-		if err := cmd.Run(); err != nil {
+		if err := runShellCommand(command); err != nil {
 			log.Warn("Pre-command failed (ignoring)", "command", command, "err", err)
 			// Continue with other pre-commands even if one fails
 		}
@@ -349,13 +318,7 @@ func runCleanupCommands(commands []string) {
 	for _, command := range commands {
 		log.Info("Running", "command", command)
 
-		// Create command
-		cmd := exec.Command("bash", "-c", command)
-		cmd.Stdout = os.Stdout
-		cmd.Stderr = os.Stderr
-
-		// Run the command
-		if err := cmd.Run(); err != nil {
+		if err := runShellCommand(command); err != nil {
 			log.Error("Error running cleanup command", "command", command, "err", err)
 			// Continue with other cleanup commands even if one fails
 		}
@@ -363,55 +326,99 @@ func runCleanupCommands(commands []string) {
 	log.Info("Cleanup complete")
 }
 
+// runShellCommand runs a single non-interactive command with bash, streaming
+// its output straight to the terminal. It is shared by the pre-commands and
+// cleanup commands.
+func runShellCommand(command string) error {
+	cmd := exec.Command("bash", "-c", command)
+	cmd.Stdout = os.Stdout
+	cmd.Stderr = os.Stderr
+	return cmd.Run()
+}
+
+// loadDocciConfig decodes a JSON config file straight from disk without
+// buffering the whole file first
+func loadDocciConfig(path string) (DocciConfig, error) {
+	var config DocciConfig
+	f, err := os.Open(path)
+	if err != nil {
+		return config, err
+	}
+	defer f.Close()
+
+	err = json.NewDecoder(f).Decode(&config)
+	return config, err
+}
+
+// findGitRoot walks up from the current working directory looking for a .git
+// entry, matching what `git rev-parse --show-toplevel` reports without forking
+// git. A .git file (worktrees, submodules) counts as a repository root too.
+// Returns an empty string when not inside a git repository.
+func findGitRoot() string {
+	dir, err := os.Getwd()
+	if err != nil {
+		return ""
+	}
+	for {
+		if _, err := os.Stat(filepath.Join(dir, ".git")); err == nil {
+			return dir
+		}
+		parent := filepath.Dir(dir)
+		if parent == dir {
+			return ""
+		}
+		dir = parent
+	}
+}
+
 // parseFileList parses comma separated file paths or JSON config file
 func parseFileList(input string) []string {
 	// Check if input is a JSON file
-	if strings.HasSuffix(strings.ToLower(input), ".json") {
+	if strings.EqualFold(filepath.Ext(input), ".json") {
 		// Try to read and parse as JSON config
-		configData, err := os.ReadFile(input)
-		if err == nil {
-			var config DocciConfig
-			if jsonErr := json.Unmarshal(configData, &config); jsonErr == nil && len(config.Files) > 0 {
-				// Successfully parsed JSON config
-				// Get the directory containing the JSON file
-				configDir := filepath.Dir(input)
-
-				// Get git root for fallback
-				var gitRoot string
-				cmd := exec.Command("git", "rev-parse", "--show-toplevel")
-				if output, err := cmd.Output(); err == nil {
-					gitRoot = strings.TrimSpace(string(output))
-				}
+		if config, err := loadDocciConfig(input); err == nil && len(config.Files) > 0 {
+			// Successfully parsed JSON config
+			// Get the directory containing the JSON file
+			configDir := filepath.Dir(input)
+
+			// Git root for fallback, only looked up once a file is missing
+			// relative to the config directory
+			gitRoot, gitRootResolved := "", false
+
+			// Resolve relative file paths
+			var resolvedFiles []string
+			for _, file := range config.Files {
+				// If the file path is absolute, use it as-is
+				if filepath.IsAbs(file) {
+					resolvedFiles = append(resolvedFiles, file)
+				} else {
+					// First try relative to the JSON config directory
+					resolvedPath := filepath.Join(configDir, file)
+					if _, err := os.Stat(resolvedPath); err == nil {
+						resolvedFiles = append(resolvedFiles, resolvedPath)
+						continue
+					}
 
-				// Resolve relative file paths
-				var resolvedFiles []string
-				for _, file := range config.Files {
-					// If the file path is absolute, use it as-is
-					if filepath.IsAbs(file) {
-						resolvedFiles = append(resolvedFiles, file)
-					} else {
-						// First try relative to the JSON config directory
-						resolvedPath := filepath.Join(configDir, file)
-						if _, err := os.Stat(resolvedPath); err == nil {
-							resolvedFiles = append(resolvedFiles, resolvedPath)
-						} else if gitRoot != "" {
-							// If not found, try relative to git root
-							rootPath := filepath.Join(gitRoot, file)
-							if _, err := os.Stat(rootPath); err == nil {
-								resolvedFiles = append(resolvedFiles, rootPath)
-							} else {
-								// If still not found, use the original resolved path
-								// (will fail later with proper error message)
-								resolvedFiles = append(resolvedFiles, resolvedPath)
-							}
+					if !gitRootResolved {
+						gitRoot, gitRootResolved = findGitRoot(), true
+					}
+					if gitRoot != "" {
+						// If not found, try relative to git root
+						rootPath := filepath.Join(gitRoot, file)
+						if _, err := os.Stat(rootPath); err == nil {
+							resolvedFiles = append(resolvedFiles, rootPath)
 						} else {
-							// No git root available, use original resolved path
+							// If still not found, use the original resolved path
+							// (will fail later with proper error message)
 							resolvedFiles = append(resolvedFiles, resolvedPath)
 						}
+					} else {
+						// No git root available, use original resolved path
+						resolvedFiles = append(resolvedFiles, resolvedPath)
 					}
 				}
-				return resolvedFiles
 			}
+			return resolvedFiles
 		}
 		// If we can't parse as JSON config, treat it as a regular file
 	}
@@ -422,11 +429,11 @@ func parseFileList(input string) []string {
 		return []string{strings.TrimSpace(input)}
 	}
 
+	// Trim and drop empty entries in place, reusing the split slice
 	files := strings.Split(input, ",")
-	var result []string
+	result := files[:0]
 	for _, file := range files {
-		trimmed := strings.TrimSpace(file)
-		if trimmed != "" {
+		if trimmed := strings.TrimSpace(file); trimmed != "" {
 			result = append(result, trimmed)
 		}
 	}
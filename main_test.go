@@ -0,0 +1,46 @@
+package main
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestPreCommandsContinueAfterFailures(t *testing.T) {
+	dir := t.TempDir()
+	first := filepath.Join(dir, "first")
+	last := filepath.Join(dir, "last")
+
+	err := runPreCommands([]string{
+		"touch " + first,
+		"false",
+		`echo "oops`, // unterminated quote, a syntax error
+		"cd / && exit 3",
+		"touch " + last,
+	})
+	require.NoError(t, err)
+
+	// Commands after the failing and malformed ones still ran
+	_, err = os.Stat(first)
+	require.NoError(t, err)
+	_, err = os.Stat(last)
+	require.NoError(t, err)
+}
+
+func TestCleanupCommandsKeepWorkingDirectory(t *testing.T) {
+	dir := t.TempDir()
+	wd, err := os.Getwd()
+	require.NoError(t, err)
+
+	// A cd in one command must not change where the next one runs
+	runCleanupCommands([]string{
+		"cd " + dir,
+		"pwd > " + filepath.Join(dir, "pwd"),
+	})
+
+	out, err := os.ReadFile(filepath.Join(dir, "pwd"))
+	require.NoError(t, err)
+	require.Equal(t, wd+"\n", string(out))
+}
@@ -4,6 +4,7 @@ import (
 	"fmt"
 	"net/http"
 	"os"
+	"slices"
 	"sort"
 	"strconv"
 	"strings"
@@ -40,8 +41,6 @@ type CodeBlock struct {
 	ResetFile   bool   // docci-reset-file: Reset the file to its original content
 	LineInsert  int    // docci-line-insert: Insert content at line N (1-based)
 	LineReplace string // docci-line-replace: Replace content at line N or N-M
-
-	content strings.Builder // Used during parsing to build content
 }
 
 // given a markdown file, parse out all the code blocks within it.
@@ -79,12 +78,6 @@ func (c *CodeBlock) applyTags(tags MetaTag, lineNumber int, fileName string) {
 	c.LineReplace = tags.LineReplace
 	c.LineNumber = lineNumber
 	c.FileName = fileName
-	c.content.Reset()
-}
-
-// finalize converts the accumulated content from the builder to the Content field
-func (c *CodeBlock) finalize() {
-	c.Content = c.content.String()
 }
 
 // GetRetryDelay returns the retry delay in seconds from environment variable or default
@@ -104,40 +97,52 @@ func ParseCodeBlocks(markdown string) ([]CodeBlock, error) {
 
 // ParseCodeBlocksWithFileName returns structured code blocks with metadata and filename
 func ParseCodeBlocksWithFileName(markdown string, fileName string) ([]CodeBlock, error) {
+	log := logger.GetLogger()
+	debugEnabled := logger.IsDebugEnabled() // checked once, the per-line log is the hot path
 	var codeBlocks []CodeBlock
 	var currentBlock *CodeBlock
-	lines := splitIntoLines(markdown)
+	var content strings.Builder // content of currentBlock, kept out of CodeBlock itself
+	// docci-if-not-installed results for this parse. All checks happen before any
+	// block runs, so blocks naming the same command can share one PATH lookup.
+	runIfNotInstalled := make(map[string]bool)
 	startParsing := false
-	for idx, line := range lines {
-		lineNumber := idx + 1 // 1-based index for line numbers
+	lineNumber := 0
+	// Walk the markdown line by line without materialising a slice of lines.
+	// Trailing carriage returns are dropped so files with CRLF line endings
+	// still match closing fences.
+	for rest := markdown; rest != ""; {
+		var line string
+		line, rest, _ = strings.Cut(rest, "\n")
+		line = strings.TrimRight(line, "\r")
+		lineNumber++ // 1-based index for line numbers
 
 		// stop the parsing when the codeblock ends
 		if startParsing {
 			if strings.Trim(line, " ") == "```" {
-				if currentBlock != nil && currentBlock.content.Len() > 0 {
-					// Only add the block if it should run on current OS and command conditions are met
-					if ShouldRunOnCurrentOS(currentBlock.OS) && ShouldRunBasedOnCommandInstallation(currentBlock.IfNotInstalled) {
-						currentBlock.finalize()
-						codeBlocks = append(codeBlocks, *currentBlock)
-					} else {
-						logger.GetLogger().Debug("Skipping code block due to OS restriction", "required_os", currentBlock.OS, "current_os", GetCurrentOS())
-					}
-					currentBlock = nil
+				if currentBlock != nil && content.Len() > 0 {
+					currentBlock.Content = content.String()
+					codeBlocks = append(codeBlocks, *currentBlock)
 				}
+				currentBlock = nil
 				startParsing = false
 				continue
 			}
 
-			// if not, then we add the text to the codeblock
+			// if not, then we add the text to the codeblock. Skipped blocks have no
+			// currentBlock, so their content is passed over without being copied.
 			if currentBlock != nil {
-				currentBlock.content.WriteString(line)
-				currentBlock.content.WriteString("\n")
-				logger.GetLogger().Debug("Adding line to code block", "line_number", lineNumber, "content", line)
+				content.WriteString(line)
+				content.WriteString("\n")
+				if debugEnabled {
+					log.Debug("Adding line to code block", "line_number", lineNumber, "content", line)
+				}
 			}
+			// Inside a block only the bare closing fence matters, so content lines
+			// never pay for fence detection and tag parsing
+			continue
 		}
 
 		// we only start parsing if the line contains ```bash, ```shell, or ```sh
-		// TODO: only run this if startParsing is false?
 		if strings.HasPrefix(line, "```") {
 			// Parse tags first to check for ignore
 			tags, err := ParseTags(line)
@@ -146,27 +151,40 @@ func ParseCodeBlocksWithFileName(markdown string, fileName string) ([]CodeBlock,
 			}
 
 			if tags.Ignore {
-				logger.GetLogger().Debug("Ignoring code block due to docci-ignore tag")
+				log.Debug("Ignoring code block due to docci-ignore tag")
 				continue
 			}
 
-			// Extract just the language part (before any tags)
-			lang := strings.TrimPrefix(line, "```")
-			lang = strings.TrimSpace(lang)
-			// Split by space to get just the language part
-			langParts := strings.Fields(lang)
-			if len(langParts) > 0 {
-				lang = langParts[0]
-			}
+			// Just the language part (before any tags), as found by ParseTags
+			lang := tags.Language
 
 			// Allow block if it's a valid language OR if it has file operation tags
-			if contains(ValidLangs, lang) || tags.File != "" {
+			if slices.Contains(ValidLangs, lang) || tags.File != "" {
 				// Validate tag combinations using the centralized validation
 				if err := tags.Validate(lineNumber); err != nil {
 					return nil, err
 				}
 
 				startParsing = true
+				content.Reset()
+
+				// Only keep the block if it should run on current OS and command
+				// conditions are met. The decision is made at the opening fence so
+				// a skipped block's lines are never collected.
+				shouldRun := ShouldRunOnCurrentOS(tags.OS)
+				if shouldRun && tags.IfNotInstalled != "" {
+					run, checked := runIfNotInstalled[tags.IfNotInstalled]
+					if !checked {
+						run = ShouldRunBasedOnCommandInstallation(tags.IfNotInstalled)
+						runIfNotInstalled[tags.IfNotInstalled] = run
+					}
+					shouldRun = run
+				}
+				if !shouldRun {
+					log.Debug("Skipping code block due to OS restriction", "required_os", tags.OS, "current_os", GetCurrentOS())
+					continue
+				}
+
 				currentBlock = newCodeBlock(len(codeBlocks)+1, lang)
 				currentBlock.applyTags(tags, lineNumber, fileName)
 				continue
@@ -262,77 +280,82 @@ func BuildExecutableScriptWithOptions(blocks []CodeBlock, opts types.DocciOpts)
 	// Add trap at the beginning to clean up background processes
 	// Only set the trap if keepRunning is false
 	if !opts.KeepRunning {
-		script.WriteString(replaceTemplateVars(scriptCleanupTemplate, map[string]string{
+		writeTemplate(&script, scriptCleanupTemplate, map[string]string{
 			"DEBUG_CLEANUP": formatDebugCleanup(debugEnabled),
-		}))
+		})
 	}
 
 	var backgroundIndexes []int
 
+	// The retry delay comes from the environment, which does not change while
+	// the script is built, so it is looked up once for all retried blocks
+	retrySleep := formatRetrySleep(GetRetryDelay())
+
 	for _, block := range blocks {
+		// Used by most of the templates below, so only formatted once per block
+		index := strconv.Itoa(block.Index)
+		fileInfo := formatFileInfo(block.FileName)
+
 		// Handle background kill first if specified
 		if block.BackgroundKill > 0 {
-			script.WriteString(replaceTemplateVars(backgroundKillTemplate, map[string]string{
+			writeTemplate(&script, backgroundKillTemplate, map[string]string{
 				"KILL_INDEX": strconv.Itoa(block.BackgroundKill),
-				"FILE_INFO":  formatFileInfo(block.FileName),
-			}))
+				"FILE_INFO":  fileInfo,
+			})
 		}
 
 		if block.Background {
 			// For background blocks, wrap in { } & and redirect output
-			script.WriteString(replaceTemplateVars(backgroundBlockTemplate, map[string]string{
-				"INDEX":     strconv.Itoa(block.Index),
-				"FILE_INFO": formatFileInfo(block.FileName),
+			writeTemplate(&script, backgroundBlockTemplate, map[string]string{
+				"INDEX":     index,
+				"FILE_INFO": fileInfo,
 				"CONTENT":   block.Content,
-			}))
+			})
 			backgroundPIDs = append(backgroundPIDs, fmt.Sprintf("$DOCCI_BG_PID_%d", block.Index))
 			backgroundIndexes = append(backgroundIndexes, block.Index)
 		} else {
 			// Regular blocks with markers (always generated for parsing)
-			script.WriteString(replaceTemplateVars(blockStartMarkerTemplate, map[string]string{
-				"INDEX": strconv.Itoa(block.Index),
-			}))
+			writeTemplate(&script, blockStartMarkerTemplate, map[string]string{
+				"INDEX": index,
+			})
 
 			// Add the block header comment only in debug mode
 			if debugEnabled {
-				script.WriteString(replaceTemplateVars(blockHeaderTemplate, map[string]string{
-					"INDEX":     strconv.Itoa(block.Index),
+				writeTemplate(&script, blockHeaderTemplate, map[string]string{
+					"INDEX":     index,
 					"LANGUAGE":  block.Language,
-					"FILE_INFO": formatFileInfo(block.FileName),
-				}))
+					"FILE_INFO": fileInfo,
+				})
 			}
 
 			// Add delay before block if specified
 			if block.DelayBeforeSecs > 0 {
-				script.WriteString(replaceTemplateVars(delayBeforeTemplate, map[string]string{
-					"INDEX": strconv.Itoa(block.Index),
+				writeTemplate(&script, delayBeforeTemplate, map[string]string{
+					"INDEX": index,
 					"DELAY": strconv.FormatFloat(block.DelayBeforeSecs, 'g', -1, 64),
-				}))
+				})
 			}
 
 			// Add wait-for-endpoint logic if needed
 			if block.WaitForEndpoint != "" {
-				script.WriteString(replaceTemplateVars(waitForEndpointTemplate, map[string]string{
+				writeTemplate(&script, waitForEndpointTemplate, map[string]string{
 					"ENDPOINT": block.WaitForEndpoint,
 					"TIMEOUT":  strconv.Itoa(block.WaitTimeoutSecs),
-				}))
+				})
 			}
 
 			// Add file existence check as guard clause if needed
 			if block.IfFileNotExists != "" {
-				script.WriteString(replaceTemplateVars(fileExistenceGuardStartTemplate, map[string]string{
+				writeTemplate(&script, fileExistenceGuardStartTemplate, map[string]string{
 					"FILE":  block.IfFileNotExists,
-					"INDEX": strconv.Itoa(block.Index),
-				}))
+					"INDEX": index,
+				})
 			}
 
 			// Apply text replacement if needed
 			blockContent := block.Content
 			if block.ReplaceText != "" {
-				parts := strings.SplitN(block.ReplaceText, ";", 2)
-				if len(parts) == 2 {
-					oldText := parts[0]
-					newText := parts[1]
+				if oldText, newText, found := strings.Cut(block.ReplaceText, ";"); found {
 					blockContent = strings.ReplaceAll(blockContent, oldText, newText)
 					log.Debug("Applied text replacement", "block", block.Index, "old", oldText, "new", newText)
 				}
@@ -347,67 +370,64 @@ func BuildExecutableScriptWithOptions(blocks []CodeBlock, opts types.DocciOpts)
 					if block.ResetFile {
 						operation = "reset"
 					}
-					script.WriteString(replaceTemplateVars(fileCreateOrResetTemplate, map[string]string{
+					writeTemplate(&script, fileCreateOrResetTemplate, map[string]string{
 						"OPERATION": operation,
 						"FILE":      block.File,
-						"FILE_INFO": formatFileInfo(block.FileName),
+						"FILE_INFO": fileInfo,
 						"CONTENT":   blockContent,
-					}))
+					})
 				} else if block.LineInsert > 0 {
 					// Insert at line
-					script.WriteString(replaceTemplateVars(fileLineInsertTemplate, map[string]string{
+					writeTemplate(&script, fileLineInsertTemplate, map[string]string{
 						"FILE":      block.File,
 						"LINE":      strconv.Itoa(block.LineInsert),
-						"FILE_INFO": formatFileInfo(block.FileName),
+						"FILE_INFO": fileInfo,
 						"CONTENT":   blockContent,
-					}))
+					})
 				} else if block.LineReplace != "" {
 					// Replace line(s)
-					startLine := ""
-					endLine := ""
-
-					if strings.Contains(block.LineReplace, "-") {
-						parts := strings.Split(block.LineReplace, "-")
-						startLine = strings.TrimSpace(parts[0])
-						endLine = strings.TrimSpace(parts[1])
+					startLine, endLine, found := strings.Cut(block.LineReplace, "-")
+					if found {
+						startLine = strings.TrimSpace(startLine)
+						endLine = strings.TrimSpace(endLine)
 					} else {
-						startLine = block.LineReplace
-						endLine = block.LineReplace
+						endLine = startLine
 					}
 
-					script.WriteString(replaceTemplateVars(fileLineReplaceTemplate, map[string]string{
+					writeTemplate(&script, fileLineReplaceTemplate, map[string]string{
 						"FILE":       block.File,
 						"LINES":      block.LineReplace,
 						"START_LINE": startLine,
 						"END_LINE":   endLine,
-						"FILE_INFO":  formatFileInfo(block.FileName),
+						"FILE_INFO":  fileInfo,
 						"CONTENT":    blockContent,
-					}))
+					})
 				}
 			} else {
-				// Regular code execution (not a file operation)
-				// Prepare the code content with per-command delay and command display
+				// Regular code execution (not a file operation), wrapped in retry
+				// logic if needed. The code is rendered straight into the script
+				// rather than into an intermediate string first.
+				if block.RetryCount > 0 {
+					writeTemplate(&script, retryWrapperStartTemplate, map[string]string{
+						"INDEX":       index,
+						"MAX_RETRIES": strconv.Itoa(block.RetryCount),
+						"RETRY_SLEEP": retrySleep,
+					})
+				}
+
+				// Add the code with per-command delay and command display
 				delaySeconds := block.DelayPerCmdSecs
-				codeContent := replaceTemplateVars(codeExecutionTemplate, map[string]string{
+				writeTemplate(&script, codeExecutionTemplate, map[string]string{
 					"DELAY":      strconv.FormatFloat(delaySeconds, 'g', -1, 64),
+					"DELAY_CMD":  formatCmdDelay(delaySeconds),
 					"BASH_FLAGS": formatBashFlags(block.AssertFailure),
 					"CONTENT":    blockContent,
 				})
 
-				// Add the actual code with retry logic if needed
 				if block.RetryCount > 0 {
-					retryDelay := GetRetryDelay()
-					script.WriteString(replaceTemplateVars(retryWrapperStartTemplate, map[string]string{
-						"INDEX":       strconv.Itoa(block.Index),
-						"MAX_RETRIES": strconv.Itoa(block.RetryCount),
-						"RETRY_DELAY": strconv.Itoa(retryDelay),
-					}))
-					script.WriteString(codeContent)
-					script.WriteString(replaceTemplateVars(retryWrapperEndTemplate, map[string]string{
-						"INDEX": strconv.Itoa(block.Index),
-					}))
-				} else {
-					script.WriteString(codeContent)
+					writeTemplate(&script, retryWrapperEndTemplate, map[string]string{
+						"INDEX": index,
+					})
 				}
 			}
 
@@ -418,16 +438,16 @@ func BuildExecutableScriptWithOptions(blocks []CodeBlock, opts types.DocciOpts)
 
 			// Add delay after block if specified
 			if block.DelayAfterSecs > 0 {
-				script.WriteString(replaceTemplateVars(delayAfterTemplate, map[string]string{
-					"INDEX": strconv.Itoa(block.Index),
+				writeTemplate(&script, delayAfterTemplate, map[string]string{
+					"INDEX": index,
 					"DELAY": strconv.FormatFloat(block.DelayAfterSecs, 'g', -1, 64),
-				}))
+				})
 			}
 
 			// Add a marker after the block
-			script.WriteString(replaceTemplateVars(blockEndMarkerTemplate, map[string]string{
-				"INDEX": strconv.Itoa(block.Index),
-			}))
+			writeTemplate(&script, blockEndMarkerTemplate, map[string]string{
+				"INDEX": index,
+			})
 
 			// Store validation requirement if present
 			if block.OutputContains != "" {
@@ -444,29 +464,29 @@ func BuildExecutableScriptWithOptions(blocks []CodeBlock, opts types.DocciOpts)
 	if len(backgroundIndexes) > 0 && !opts.HideBackgroundLogs {
 		var logEntries strings.Builder
 		for _, bgIndex := range backgroundIndexes {
-			logEntries.WriteString(replaceTemplateVars(backgroundLogEntryTemplate, map[string]string{
+			writeTemplate(&logEntries, backgroundLogEntryTemplate, map[string]string{
 				"INDEX": strconv.Itoa(bgIndex),
-			}))
+			})
 		}
-		script.WriteString(replaceTemplateVars(backgroundLogsDisplayTemplate, map[string]string{
+		writeTemplate(&script, backgroundLogsDisplayTemplate, map[string]string{
 			"LOG_ENTRIES": logEntries.String(),
-		}))
+		})
 	} else if len(backgroundIndexes) > 0 && opts.HideBackgroundLogs {
 		// Still clean up the background output files even if we're not displaying them
 		var cleanupCommands strings.Builder
 		for _, bgIndex := range backgroundIndexes {
 			cleanupCommands.WriteString(fmt.Sprintf("rm -f /tmp/docci_bg_%d.out\n", bgIndex))
 		}
-		script.WriteString(replaceTemplateVars(backgroundLogsCleanupTemplate, map[string]string{
+		writeTemplate(&script, backgroundLogsCleanupTemplate, map[string]string{
 			"CLEANUP_COMMANDS": cleanupCommands.String(),
-		}))
+		})
 	}
 
 	// Add infinite sleep if keepRunning is true (as a final block)
 	if opts.KeepRunning {
-		script.WriteString(replaceTemplateVars(keepRunningTemplate, map[string]string{
+		writeTemplate(&script, keepRunningTemplate, map[string]string{
 			"DEBUG_CLEANUP": formatDebugCleanup(debugEnabled),
-		}))
+		})
 	}
 
 	return script.String(), validationMap, assertFailureMap
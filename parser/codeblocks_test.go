@@ -266,6 +266,75 @@ func TestDelayPerCmdFloatParsing(t *testing.T) {
 	require.Contains(t, script, "sleep 0.1")
 }
 
+func TestNoDelayPerCmdSkipsSleep(t *testing.T) {
+	t.Parallel()
+	markdown := `
+# Test No Delay Per Command
+
+` + "```bash\necho \"test\"\n```" + `
+	`
+
+	blocks, err := ParseCodeBlocks(markdown)
+	require.NoError(t, err)
+	require.Len(t, blocks, 1)
+
+	// Without a per-command delay the DEBUG trap should not fork a sleep
+	script, _, _ := BuildExecutableScript(blocks)
+	require.Contains(t, script, "Executing CMD: $BASH_COMMAND\" >&2' DEBUG")
+	require.NotContains(t, script, "sleep 0")
+}
+
+func TestCRLFLineEndings(t *testing.T) {
+	t.Parallel()
+	markdown := "# Test CRLF\r\n\r\n```bash\r\necho \"first\"\r\n```\r\n\r\n```bash\r\necho \"second\"\r\n```\r\n"
+
+	blocks, err := ParseCodeBlocks(markdown)
+	require.NoError(t, err)
+	require.Len(t, blocks, 2)
+	require.Equal(t, "echo \"first\"\n", blocks[0].Content)
+	require.Equal(t, "echo \"second\"\n", blocks[1].Content)
+}
+
+func TestFenceLikeLineInBlockContent(t *testing.T) {
+	t.Parallel()
+	// Only a bare ``` closes a block, a fence with an info string is content
+	markdown := "```bash\ncat <<'EOF' > README.md\n```sh\nEOF\n```\n"
+
+	blocks, err := ParseCodeBlocks(markdown)
+	require.NoError(t, err)
+	require.Len(t, blocks, 1)
+	require.Equal(t, "cat <<'EOF' > README.md\n```sh\nEOF\n", blocks[0].Content)
+}
+
+func TestTemplateSyntaxInBlockContent(t *testing.T) {
+	t.Parallel()
+	markdown := "```bash\ndocker ps --format '{{.Names}}' || true\n```\n"
+
+	blocks, err := ParseCodeBlocks(markdown)
+	require.NoError(t, err)
+	require.Len(t, blocks, 1)
+
+	// Block content is user data, not a template, and must be kept verbatim
+	script, _, _ := BuildExecutableScript(blocks)
+	require.Contains(t, script, "docker ps --format '{{.Names}}' || true")
+}
+
+func TestLongOutputLine(t *testing.T) {
+	t.Parallel()
+	// A single 100KB line is well past bufio.Scanner's default token limit
+	markdown := "```bash\nhead -c 100000 /dev/zero | tr '\\0' 'a'; echo\n```\n"
+
+	blocks, err := ParseCodeBlocks(markdown)
+	require.NoError(t, err)
+	require.Len(t, blocks, 1)
+
+	script, _, _ := BuildExecutableScript(blocks)
+	resp, err := executor.Exec(script)
+	require.NoError(t, err, "Exec should start")
+	require.NoError(t, resp.Error, "Script execution should succeed")
+	require.Contains(t, resp.Stdout, strings.Repeat("a", 100000))
+}
+
 func TestCommandSubstitutionNoDebugContamination(t *testing.T) {
 	// Test that command substitution captures only the command output,
 	// not the debug "Executing CMD:" messages
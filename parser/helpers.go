@@ -1,27 +0,0 @@
-package parser
-
-func contains(slice []string, item string) bool {
-	for _, v := range slice {
-		if v == item {
-			return true
-		}
-	}
-	return false
-}
-
-func splitIntoLines(markdown string) []string {
-	var lines []string
-	currentLine := ""
-	for _, char := range markdown {
-		if char == '\n' {
-			lines = append(lines, currentLine)
-			currentLine = ""
-		} else {
-			currentLine += string(char)
-		}
-	}
-	if currentLine != "" {
-		lines = append(lines, currentLine)
-	}
-	return lines
-}
@@ -5,7 +5,10 @@ const (
 	// Main script template with cleanup trap
 	scriptCleanupTemplate = `# Cleanup function for background processes
 cleanup_background_processes() {
-{{DEBUG_CLEANUP}} jobs -p | xargs -r kill 2>/dev/null
+{{DEBUG_CLEANUP}}  local pids=($(jobs -p))
+  # Background blocks lead their own process groups: signal each whole group,
+  # then the job itself for jobs started without one
+  kill -TERM "${pids[@]/#/-}" "${pids[@]}" 2>/dev/null || true
 }
 trap cleanup_background_processes EXIT
 
@@ -27,9 +30,12 @@ fi
 
 	// Background block template
 	backgroundBlockTemplate = `# Background block {{INDEX}}{{FILE_INFO}}
+# Job control puts the block in its own process group so it can be killed as a whole
+set -m
 (
 {{CONTENT}}) > /tmp/docci_bg_{{INDEX}}.out 2>&1 &
 DOCCI_BG_PID_{{INDEX}}=$!
+set +m
 echo 'Started background process {{INDEX}} with PID '$DOCCI_BG_PID_{{INDEX}}
 
 `
@@ -53,13 +59,16 @@ echo 'Waiting for endpoint {{ENDPOINT}} to be ready...'
 
 timeout_secs={{TIMEOUT}}
 endpoint_url="{{ENDPOINT}}"
-start_time=$(date +%s)
+start_time=$SECONDS
+delay_ms=50
+waited_ms=0
 
 while true; do
-    current_time=$(date +%s)
-    elapsed=$((current_time - start_time))
+    elapsed=$((SECONDS - start_time))
 
-    if [ $elapsed -ge $timeout_secs ]; then
+    # SECONDS only ticks on whole seconds, so time out on the sleeps taken and
+    # fall back to the wall clock when the probes themselves are slow
+    if [ $waited_ms -ge $((timeout_secs * 1000)) ] || [ $elapsed -gt $timeout_secs ]; then
         echo "Timeout waiting for endpoint $endpoint_url after $timeout_secs seconds"
         exit 1
     fi
@@ -69,8 +78,19 @@ while true; do
         break
     fi
 
-    echo "Endpoint not ready yet, retrying in 1 second... (elapsed: ${elapsed}s)"
-    sleep 1
+    if [ $delay_ms -gt $((timeout_secs * 1000 - waited_ms)) ]; then
+        delay_ms=$((timeout_secs * 1000 - waited_ms))
+    fi
+    echo "Endpoint not ready yet, retrying in ${delay_ms}ms... (elapsed: ${elapsed}s)"
+    printf -v delay_secs '%d.%03d' $((delay_ms / 1000)) $((delay_ms % 1000))
+    sleep "$delay_secs"
+    waited_ms=$((waited_ms + delay_ms))
+
+    # Back off exponentially so fast endpoints are seen quickly, capped at 1 second
+    delay_ms=$((delay_ms * 2))
+    if [ $delay_ms -gt 1000 ]; then
+        delay_ms=1000
+    fi
 done
 
 `
@@ -81,14 +101,12 @@ if [ -f "{{FILE}}" ]; then
   echo "Skipping block {{INDEX}}: file {{FILE}} already exists"
 else
   echo "File {{FILE}} does not exist, executing block {{INDEX}}"
-fi
-if [ ! -f "{{FILE}}" ]; then
 `
 
 	// Code execution with per-command delay template
 	codeExecutionTemplate = `# Enable per-command delay ({{DELAY}} seconds) and command display
 set {{BASH_FLAGS}}
-trap 'echo -e "\n     Executing CMD: $BASH_COMMAND" >&2; sleep {{DELAY}}' DEBUG
+trap 'echo -e "\n     Executing CMD: $BASH_COMMAND" >&2{{DELAY_CMD}}' DEBUG
 
 {{CONTENT}}
 trap - DEBUG # reset trap
@@ -101,8 +119,7 @@ max_retries={{MAX_RETRIES}}
 while [ $retry_count -le $max_retries ]; do
   if [ $retry_count -gt 0 ]; then
     echo "Retry attempt $retry_count/$max_retries for block {{INDEX}}"
-    sleep {{RETRY_DELAY}}
-  fi
+{{RETRY_SLEEP}}  fi
 
   # Execute the block content
   if (
@@ -160,7 +177,8 @@ echo '\n🔄 Keeping containers running. Press Ctrl+C to stop...'
 
 # Cleanup function for background processes (on interrupt)
 cleanup_on_interrupt() {
-{{DEBUG_CLEANUP}}  jobs -p | xargs -r kill 2>/dev/null
+{{DEBUG_CLEANUP}}  local pids=($(jobs -p))
+  kill -TERM "${pids[@]/#/-}" "${pids[@]}" 2>/dev/null || true
   exit 0
 }
 trap cleanup_on_interrupt INT TERM
@@ -176,29 +194,23 @@ cat > "{{FILE}}" << 'DOCCI_EOF'
 
 	fileLineInsertTemplate = `# File operation: insert at line {{LINE}} in {{FILE}}{{FILE_INFO}}
 if [ -f "{{FILE}}" ]; then
-  # Create a temporary file
-  temp_file=$(mktemp)
-
-  # Read existing content and insert at specified line
-  line_count=0
-  inserted=false
-  while IFS= read -r line || [ -n "$line" ]; do
-    line_count=$((line_count + 1))
-    if [ $line_count -eq {{LINE}} ] && [ "$inserted" = "false" ]; then
-      cat << 'DOCCI_EOF' >> "$temp_file"
-{{CONTENT}}DOCCI_EOF
-      inserted=true
-    fi
-    printf '%s\n' "$line" >> "$temp_file"
-  done < "{{FILE}}"
+  # Create a temporary file next to the target so the final mv is a rename
+  temp_file=$(mktemp "{{FILE}}.XXXXXX")
 
-  # If insert line is beyond EOF, append at the end
-  total_lines=$line_count
-  if [ {{LINE}} -gt $total_lines ] && [ "$inserted" = "false" ]; then
-    cat << 'DOCCI_EOF' >> "$temp_file"
-{{CONTENT}}DOCCI_EOF
+  # Terminate an unterminated last line so the copy below keeps every line whole
+  if [ -n "$(tail -c 1 "{{FILE}}")" ]; then
+    echo >> "{{FILE}}"
   fi
 
+  # Copy the lines before the insert point, the new content, then the rest.
+  # If the insert line is beyond EOF this appends at the end.
+  {
+    head -n $(({{LINE}} - 1)) "{{FILE}}"
+    cat << 'DOCCI_EOF'
+{{CONTENT}}DOCCI_EOF
+    tail -n +{{LINE}} "{{FILE}}"
+  } > "$temp_file"
+
   # Replace original file
   mv "$temp_file" "{{FILE}}"
 else
@@ -209,29 +221,29 @@ fi
 
 	fileLineReplaceTemplate = `# File operation: replace line(s) {{LINES}} in {{FILE}}{{FILE_INFO}}
 if [ -f "{{FILE}}" ]; then
-  # Create a temporary file
-  temp_file=$(mktemp)
+  # Create a temporary file next to the target so the final mv is a rename
+  temp_file=$(mktemp "{{FILE}}.XXXXXX")
 
   # Parse line range
   start_line={{START_LINE}}
   end_line={{END_LINE}}
 
-  # Read and replace lines
-  line_count=0
-  replaced=false
-  while IFS= read -r line || [ -n "$line" ]; do
-    line_count=$((line_count + 1))
-    if [ $line_count -ge $start_line ] && [ $line_count -le $end_line ]; then
-      if [ "$replaced" = "false" ]; then
-        cat << 'DOCCI_EOF' >> "$temp_file"
+  # Terminate an unterminated last line so the copy below keeps every line whole
+  if [ -n "$(tail -c 1 "{{FILE}}")" ]; then
+    echo >> "{{FILE}}"
+  fi
+
+  # Copy the lines before the range, the new content, then the lines after it.
+  # A range starting beyond EOF leaves the file content as it was.
+  total_lines=$(wc -l < "{{FILE}}")
+  {
+    head -n $((start_line - 1)) "{{FILE}}"
+    if [ $start_line -le $total_lines ]; then
+      cat << 'DOCCI_EOF'
 {{CONTENT}}DOCCI_EOF
-        replaced=true
-      fi
-      # Skip the lines being replaced
-    else
-      printf '%s\n' "$line" >> "$temp_file"
     fi
-  done < "{{FILE}}"
+    tail -n +$((end_line + 1)) "{{FILE}}"
+  } > "$temp_file"
 
   # Replace original file
   mv "$temp_file" "{{FILE}}"
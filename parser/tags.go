@@ -3,10 +3,10 @@ package parser
 import (
 	"fmt"
 	"os/exec"
-	"regexp"
 	"runtime"
 	"strconv"
 	"strings"
+	"unicode"
 
 	"github.com/reecepbcups/docci/logger"
 )
@@ -203,48 +203,109 @@ func TagAlias(tag string) (string, error) {
 	return "", fmt.Errorf("unknown tag / alias: %s", tag)
 }
 
-// given a line, find any docci- tags that are present and parse them out
-func ParseTags(line string) (MetaTag, error) {
-	// Use regex to find all docci-* tags with optional quoted or unquoted values
-	// This pattern matches:
-	// - docci-tagname (no value)
-	// - docci-tagname=value (unquoted value, no spaces)
-	// - docci-tagname="value with spaces" (double quoted value)
-	// - docci-tagname='value with spaces' (single quoted value)
-	pattern := `docci-[a-zA-Z0-9-]+(?:=(?:"[^"]*"|'[^']*'|[^\s]+))?`
-
-	re := regexp.MustCompile(pattern)
-	matches := re.FindAllString(line, -1)
-
-	logger.GetLogger().Debug("Potential tags found", "matches", matches)
-	return parseTagsFromPotential(matches)
+// potentialTag is a docci-* tag name and its (unquoted) value as found on a line
+type potentialTag struct {
+	name    string
+	content string
 }
 
-// parseTagsFromPotential returns an error when there is a bad tag
-func parseTagsFromPotential(potential []string) (MetaTag, error) {
-	// given a list of potential tags, parse them out and return a MetaTags struct
-	var mt MetaTag
+// findTags finds all docci-* tags with optional quoted or unquoted values in
+// one left to right scan of the line. It matches:
+// - docci-tagname (no value)
+// - docci-tagname=value (unquoted value, no spaces)
+// - docci-tagname="value with spaces" (double quoted value)
+// - docci-tagname='value with spaces' (single quoted value)
+// Values are returned without their quotes. A quote that is never closed is
+// kept as part of an unquoted value.
+func findTags(line string) []potentialTag {
+	var tags []potentialTag
+
+	for i := 0; ; {
+		start := strings.Index(line[i:], "docci-")
+		if start < 0 {
+			return tags
+		}
+		start += i
 
-	for _, tag := range potential {
-		// if there is a = present, we need to extract the value
-		content := ""
-		if strings.Contains(tag, "=") {
-			logger.GetLogger().Debug("Tag with content found", "tag", tag)
+		// The name is "docci-" followed by at least one letter, digit or dash
+		end := start + len("docci-")
+		for end < len(line) && isTagNameByte(line[end]) {
+			end++
+		}
+		if end == start+len("docci-") {
+			i = start + 1
+			continue
+		}
+		tag := potentialTag{name: line[start:end]}
+
+		if end+1 < len(line) && line[end] == '=' {
+			value := line[end+1:]
+			closing := -1
+			if quote := value[0]; quote == '"' || quote == '\'' {
+				closing = strings.IndexByte(value[1:], quote)
+			}
+			if closing >= 0 {
+				tag.content = value[1 : closing+1]
+				end += 1 + closing + 2
+			} else if n := strings.IndexFunc(value, isTagSpace); n != 0 {
+				if n < 0 {
+					n = len(value)
+				}
+				tag.content = value[:n]
+				end += 1 + n
+			}
+		}
+
+		tags = append(tags, tag)
+		i = end
+	}
+}
 
-			s := strings.SplitN(tag, "=", 2) // Use SplitN to only split on first =
-			logger.GetLogger().Debug("Split tag into parts", "parts", s)
+// isTagNameByte reports whether b may appear in a tag name after "docci-"
+func isTagNameByte(b byte) bool {
+	return 'a' <= b && b <= 'z' || 'A' <= b && b <= 'Z' || '0' <= b && b <= '9' || b == '-'
+}
 
-			tag = s[0]     // take only the tag part before the =
-			content = s[1] // take the content part after the =
+// isTagSpace reports whether r ends an unquoted tag value
+func isTagSpace(r rune) bool {
+	return r == ' ' || r == '\t' || r == '\n' || r == '\f' || r == '\r'
+}
 
-			// Remove quotes if present (both single and double quotes)
-			if (strings.HasPrefix(content, "\"") && strings.HasSuffix(content, "\"")) ||
-				(strings.HasPrefix(content, "'") && strings.HasSuffix(content, "'")) {
-				content = content[1 : len(content)-1] // Remove first and last character (quotes)
-			}
+// given a line, find any docci- tags that are present and parse them out
+func ParseTags(line string) (MetaTag, error) {
+	var mt MetaTag
+
+	// Most fences carry no tags at all, so only scan for them when one could match
+	if strings.Contains(line, "docci-") {
+		potential := findTags(line)
+
+		logger.GetLogger().Debug("Potential tags found", "matches", potential)
+		var err error
+		mt, err = parseTagsFromPotential(potential)
+		if err != nil {
+			return MetaTag{}, err
+		}
+	}
 
-			tag = strings.TrimSpace(tag) // trim any spaces
+	// The language is the first word after the opening backticks, taken here so
+	// callers do not have to split the fence line a second time
+	if rest, found := strings.CutPrefix(line, "```"); found {
+		rest = strings.TrimLeftFunc(rest, unicode.IsSpace)
+		if end := strings.IndexFunc(rest, unicode.IsSpace); end >= 0 {
+			rest = rest[:end]
 		}
+		mt.Language = rest
+	}
+	return mt, nil
+}
+
+// parseTagsFromPotential returns an error when there is a bad tag
+func parseTagsFromPotential(potential []potentialTag) (MetaTag, error) {
+	// given a list of potential tags, parse them out and return a MetaTags struct
+	var mt MetaTag
+
+	for _, pt := range potential {
+		tag, content := pt.name, pt.content
 
 		// Normalize the tag using TagAlias
 		normalizedTag, err := TagAlias(tag)
@@ -282,12 +343,12 @@ func parseTagsFromPotential(potential []string) (MetaTag, error) {
 				return MetaTag{}, fmt.Errorf("docci-wait-for-endpoint requires a value in format 'url|timeout_seconds'")
 			}
 			// Parse format: http://localhost:8080/health|30
-			parts := strings.Split(content, "|")
-			if len(parts) != 2 {
+			url, timeoutStr, found := strings.Cut(content, "|")
+			if !found || strings.Contains(timeoutStr, "|") {
 				return MetaTag{}, fmt.Errorf("docci-wait-for-endpoint format should be 'url|timeout_seconds', got: %s", content)
 			}
-			url := strings.TrimSpace(parts[0])
-			timeoutStr := strings.TrimSpace(parts[1])
+			url = strings.TrimSpace(url)
+			timeoutStr = strings.TrimSpace(timeoutStr)
 
 			timeout, err := strconv.Atoi(timeoutStr)
 			if err != nil {
@@ -375,11 +436,11 @@ func parseTagsFromPotential(potential []string) (MetaTag, error) {
 				return MetaTag{}, fmt.Errorf("docci-replace-text requires a value in format 'old;new'")
 			}
 			// Validate format: old;new
-			parts := strings.SplitN(content, ";", 2)
-			if len(parts) != 2 {
+			oldText, newText, found := strings.Cut(content, ";")
+			if !found {
 				return MetaTag{}, fmt.Errorf("docci-replace-text format should be 'old;new', got: %s", content)
 			}
-			if parts[0] == "" || parts[1] == "" {
+			if oldText == "" || newText == "" {
 				return MetaTag{}, fmt.Errorf("docci-replace-text both old and new text must be non-empty, got: %s", content)
 			}
 			mt.ReplaceText = content
@@ -411,13 +472,12 @@ func parseTagsFromPotential(potential []string) (MetaTag, error) {
 				return MetaTag{}, fmt.Errorf("docci-line-replace requires a line number or range (e.g., '3' or '7-9')")
 			}
 			// Validate format: either a single number or N-M
-			if strings.Contains(content, "-") {
-				parts := strings.Split(content, "-")
-				if len(parts) != 2 {
+			if startStr, endStr, found := strings.Cut(content, "-"); found {
+				if strings.Contains(endStr, "-") {
 					return MetaTag{}, fmt.Errorf("invalid line range format in docci-line-replace: %s (expected 'N-M')", content)
 				}
-				startLine, err1 := strconv.Atoi(strings.TrimSpace(parts[0]))
-				endLine, err2 := strconv.Atoi(strings.TrimSpace(parts[1]))
+				startLine, err1 := strconv.Atoi(strings.TrimSpace(startStr))
+				endLine, err2 := strconv.Atoi(strings.TrimSpace(endStr))
 				if err1 != nil || err2 != nil {
 					return MetaTag{}, fmt.Errorf("invalid line numbers in docci-line-replace: %s", content)
 				}
@@ -18,6 +18,20 @@ func TestTagsGeneric(t *testing.T) {
 	require.Error(t, err)
 }
 
+func TestTagsLanguage(t *testing.T) {
+	mt, err := ParseTags("```bash docci-ignore")
+	require.NoError(t, err)
+	require.Equal(t, "bash", mt.Language)
+
+	mt, err = ParseTags("```  sh")
+	require.NoError(t, err)
+	require.Equal(t, "sh", mt.Language)
+
+	mt, err = ParseTags("```")
+	require.NoError(t, err)
+	require.Empty(t, mt.Language)
+}
+
 func TestContains(t *testing.T) {
 	pt, err := ParseTags("```bash docci-output-contains=\"test\"")
 	require.NoError(t, err)
@@ -28,6 +42,22 @@ func TestContains(t *testing.T) {
 	require.Contains(t, pt.OutputContains, "test 123")
 }
 
+func TestQuotedValues(t *testing.T) {
+	pt, err := ParseTags("```bash docci-output-contains='single quoted'")
+	require.NoError(t, err)
+	require.Equal(t, "single quoted", pt.OutputContains)
+
+	// mismatched quotes are kept
+	pt, err = ParseTags("```bash docci-output-contains=\"mixed'")
+	require.NoError(t, err)
+	require.Equal(t, "\"mixed'", pt.OutputContains)
+
+	// a lone quote is not stripped (and must not panic)
+	pt, err = ParseTags("```bash docci-output-contains=\"")
+	require.NoError(t, err)
+	require.Equal(t, "\"", pt.OutputContains)
+}
+
 func TestWaitForEndpoint(t *testing.T) {
 	// Test valid wait-for-endpoint tag
 	pt, err := ParseTags("```bash docci-wait-for-endpoint=\"http://localhost:8080/health|30\"")
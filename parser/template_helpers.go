@@ -2,44 +2,50 @@ package parser
 
 import (
 	"fmt"
-	"regexp"
+	"strconv"
 	"strings"
 )
 
-// replaceTemplateVars replaces template variables with their values.
-// Panics if unreplaced variables remain - this indicates a programming bug.
-func replaceTemplateVars(template string, vars map[string]string) string {
-	result := template
-	for key, value := range vars {
-		result = strings.ReplaceAll(result, "{{"+key+"}}", value)
-	}
-
-	// Check for any remaining unreplaced variables - programming bug if found
-	remaining := findUnreplacedVars(result)
-	if len(remaining) > 0 {
-		panic(fmt.Sprintf("unreplaced template vars (bug): %v", remaining))
-	}
-
-	return result
-}
+// writeTemplate writes template to w with its variables replaced by their
+// values, so rendered templates go straight into the script being built.
+// The template is scanned once: literal text and values are written to w
+// between the placeholders as they are found. Values are never scanned, so
+// block content that happens to contain {{...}} (Go templates, docker
+// --format) is left alone.
+// Panics if a placeholder has no value - this indicates a programming bug.
+func writeTemplate(w *strings.Builder, template string, vars map[string]string) {
+	var missing []string
 
-// findUnreplacedVars finds any remaining {{VARIABLE}} patterns in the text using regex
-func findUnreplacedVars(text string) []string {
-	var unreplaced []string
-	seen := make(map[string]bool)
+	for rest := template; rest != ""; {
+		open := strings.Index(rest, "{{")
+		if open < 0 {
+			w.WriteString(rest)
+			break
+		}
 
-	// Regex to match {{VARIABLE}} patterns
-	re := regexp.MustCompile(`\{\{[^}]+\}\}`)
-	matches := re.FindAllString(text, -1)
+		// A placeholder is "{{" closed by "}}" after one or more non-'}' bytes.
+		// Anything else is literal text, and scanning resumes after the "{".
+		name := rest[open+2:]
+		end := strings.IndexByte(name, '}')
+		if end <= 0 || !strings.HasPrefix(name[end:], "}}") {
+			w.WriteString(rest[:open+1])
+			rest = rest[open+1:]
+			continue
+		}
+		name = name[:end]
 
-	for _, match := range matches {
-		if !seen[match] {
-			unreplaced = append(unreplaced, match)
-			seen[match] = true
+		w.WriteString(rest[:open])
+		if value, ok := vars[name]; ok {
+			w.WriteString(value)
+		} else {
+			missing = append(missing, "{{"+name+"}}")
 		}
+		rest = rest[open+len(name)+4:]
 	}
 
-	return unreplaced
+	if len(missing) > 0 {
+		panic(fmt.Sprintf("unreplaced template vars (bug): %v", missing))
+	}
 }
 
 // formatFileInfo returns a formatted file info string
@@ -65,3 +71,22 @@ func formatBashFlags(assertFailure bool) string {
 	}
 	return "-eT"
 }
+
+// formatCmdDelay returns the sleep appended to the per-command DEBUG trap.
+// Without a delay no sleep is emitted, so bash does not fork a `sleep 0`
+// process before every command.
+func formatCmdDelay(delaySecs float64) string {
+	if delaySecs > 0 {
+		return "; sleep " + strconv.FormatFloat(delaySecs, 'g', -1, 64)
+	}
+	return ""
+}
+
+// formatRetrySleep returns the sleep run before each retry attempt. A zero
+// delay emits no sleep, so retries do not fork a `sleep 0` process.
+func formatRetrySleep(delaySecs int) string {
+	if delaySecs > 0 {
+		return "    sleep " + strconv.Itoa(delaySecs) + "\n"
+	}
+	return ""
+}